@@ -7,9 +7,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.services.database import get_db
 from app.services.discogs import get_discogs_service, DiscogsService
 from app.core.security import get_current_user_optional
+from app.core.exceptions import NotFoundException
 
 # Imports for background job logic
-from app.services import recommendation_service
+from app.services import music_data_service, recommendation_service
 from app.services.job_service import JobService
 from app.schemas.background_job import Job, JobCreate
 from app.models.user import User
@@ -46,7 +47,7 @@ async def request_recommendations_from_track(
         artist_name=artist_name
     )
 
-    logger.info(f"Created and dispatched background job {job.id} for track '{track_title}'.")
+    logger.info("Created and dispatched background job %s for track '%s'.", job.id, track_title)
     return job
 
 
@@ -66,18 +67,8 @@ async def get_similar_releases_endpoint(
     if not base_release:
         raise NotFoundException("Release", str(release_id))
 
-    # The logic for finding and ranking similar releases could also be moved to recommendation_service
-    # For now, we'll keep a simplified version here.
-    all_releases = (await db.execute(select(Release))).scalars().all()
-    
-    similarities = []
-    for target in all_releases:
-        if base_release.id == target.id:
-            continue
-        score = await recommendation_service.calculate_release_similarity(base_release, target)
-        if score > 0.1:
-            similarities.append({"release": target, "score": score})
-    
-    similarities.sort(key=lambda x: x["score"], reverse=True)
-    
-    return [item["release"] for item in similarities[:10]]
\ No newline at end of file
+    # Score the catalog in the database and only load the top 10, instead of materializing every release.
+    similar_releases = await recommendation_service.find_similar_releases_in_db(
+        base_release, db, min_score_threshold=0.1, limit=10
+    )
+    return [release for release, score in similar_releases]
@@ -6,7 +6,9 @@ from app.schemas.release import ReleaseResponse, ReleaseCreate
 from app.core.exceptions import NotFoundException, DuplicateError
 from typing import List, Dict
 from sqlalchemy.future import select
+from sqlalchemy.orm import selectinload
 from app.models.release import Release
+from app.models.track import Track
 from app.services.discogs import DiscogsService, get_discogs_service
 from app.services import music_data_service
 
@@ -29,7 +31,14 @@ async def search_releases(
 @router.get("/releases/", response_model=List[ReleaseResponse])
 async def list_releases(db: AsyncSession = Depends(get_db)) -> List[ReleaseResponse]:
     """List all releases in our database"""
-    result = await db.execute(select(Release))
+    # The response includes each release's artist and tracks (with their artists), so load them up front
+    # in a few queries instead of one lazy load per release
+    result = await db.execute(
+        select(Release).options(
+            selectinload(Release.tracks).selectinload(Track.artists),
+            selectinload(Release.artist)
+        )
+    )
     releases = result.scalars().all()
     return releases
 
@@ -20,6 +20,18 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
 
+    # Connection pool per worker process. Recommendation requests run several queries and Discogs saves
+    # concurrently, so the SQLAlchemy defaults (5 + 10 overflow) would make them queue for a connection.
+    # Keep WEB_CONCURRENCY * (DB_POOL_SIZE + DB_MAX_OVERFLOW) under the database's max_connections.
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 40
+
+    # Return tracebacks in error responses. Leave off in production.
+    SPINLY_DEBUG: bool = False
+
+    # Root log level (DEBUG, INFO, WARNING, ...). Per-candidate and per-request Discogs details log at DEBUG.
+    LOG_LEVEL: str = "INFO"
+
     # Use Pydantic's own mechanism to load the .env file using the absolute path.
     model_config = SettingsConfigDict(
         env_file=_dotenv_path,
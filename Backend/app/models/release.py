@@ -1,21 +1,70 @@
-from sqlalchemy import Column, Integer, String, ForeignKey
+import functools
+from sqlalchemy import Column, Integer, String, ForeignKey, Index, event
 from sqlalchemy.dialects.postgresql import ARRAY as PGARRAY
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates
 from app.services.database import Base
 
+
+@functools.lru_cache(maxsize=65_536)
+def _intern_styles(styles_norm: tuple[str, ...]) -> frozenset[str]:
+    """Returns one shared frozenset per distinct style set. Lots of releases have the same styles
+    (e.g. House + Techno), so they share a single set (and its cached hash) instead of one each."""
+    return frozenset(styles_norm)
+
+
+def _styles_lower(styles_norm) -> frozenset[str]:
+    return _intern_styles(tuple(sorted(set(styles_norm or ()))))
+
+
 class Release(Base):
     __tablename__ = "releases"
+    __table_args__ = (
+        # Lets the similarity query prune candidates with the array overlap operator (styles_norm && ...)
+        Index("ix_releases_styles_norm", "styles_norm", postgresql_using="gin"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     discogs_id = Column(Integer, unique=True, index=True, nullable=False)
     title = Column(String, nullable=False)
-    year = Column(Integer)
+    year = Column(Integer, index=True)
     label = Column(String)
     styles = Column(PGARRAY(String), nullable=True, default=[])
 
+    # Lowercased copies of label and styles, kept in sync by the validators below,
+    # so similarity scoring can compare them directly without re-normalizing on every comparison.
+    label_norm = Column(String, index=True)
+    styles_norm = Column(PGARRAY(String), nullable=True, default=[])
+
+    # styles_norm as a frozenset, for similarity scoring. Not a column: it's set when the release is loaded
+    # (see _cache_styles_lower) or its styles are set, instead of on every comparison, and is shared
+    # between releases with the same styles (see _intern_styles).
+    styles_lower: frozenset[str] = frozenset()
+
     # A release is linked to one primary artist
-    artist_id = Column(Integer, ForeignKey("artists.id"), nullable=True)
+    artist_id = Column(Integer, ForeignKey("artists.id"), nullable=True, index=True)
     artist = relationship("Artist", back_populates="releases")
     
     # A release has many tracks
-    tracks = relationship("Track", back_populates="release", cascade="all, delete-orphan")
\ No newline at end of file
+    tracks = relationship("Track", back_populates="release", cascade="all, delete-orphan")
+
+    @validates("label")
+    def _normalize_label(self, key, label):
+        self.label_norm = label.lower() if label else None
+        return label
+
+    @validates("styles")
+    def _normalize_styles(self, key, styles):
+        self.styles_norm = [s.lower() for s in styles] if styles else []
+        self.styles_lower = _styles_lower(self.styles_norm)
+        return styles
+
+
+@event.listens_for(Release, "load")
+def _cache_styles_lower(release, context):
+    release.styles_lower = _styles_lower(release.styles_norm)
+
+
+@event.listens_for(Release, "refresh")
+def _recache_styles_lower(release, context, attrs):
+    if attrs is None or "styles_norm" in attrs:
+        release.styles_lower = _styles_lower(release.styles_norm)
@@ -2,7 +2,19 @@ from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import declarative_base, sessionmaker
 from app.core.config import settings  # where DATABASE_URL lives
 
-engine = create_async_engine(settings.DATABASE_URL, echo=False)
+# query_cache_size: room for every distinct statement the app issues (default is 500), so the
+# compiled forms of the heavier queries aren't evicted and recompiled under load.
+# pool_pre_ping/pool_recycle: replace connections the server (or a proxy in between) has dropped while idle,
+# instead of failing the request that checks them out.
+engine = create_async_engine(
+    settings.DATABASE_URL,
+    echo=False,
+    query_cache_size=1200,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_pre_ping=True,
+    pool_recycle=1800,
+)
 SessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 Base = declarative_base()
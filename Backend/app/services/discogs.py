@@ -1,11 +1,47 @@
 from typing import Dict, Any
+import asyncio
 import httpx
 import logging
+import time
+from async_lru import alru_cache
 from fastapi import Depends
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Authenticated Discogs clients get 60 requests per minute; keep a little headroom.
+DISCOGS_MIN_REQUEST_INTERVAL_S = 1.1
+
+# Base release lookups: matches rarely change, while misses are retried sooner in case the release shows up
+BASE_RELEASE_LOOKUP_CACHE_SIZE = 50_000
+BASE_RELEASE_LOOKUP_TTL_S = 7 * 24 * 3600
+BASE_RELEASE_MISS_TTL_S = 3600
+
+# Search responses are small and stable for hours. Release payloads are larger and get saved to the DB on first
+# fetch anyway, so that cache is mainly there to coalesce concurrent fetches of the same release into one request.
+SEARCH_CACHE_SIZE = 4096
+SEARCH_CACHE_TTL_S = 3600
+RELEASE_CACHE_SIZE = 256
+RELEASE_CACHE_TTL_S = 600
+
+
+class RateLimiter:
+    """Spaces out request starts by a minimum interval, while letting the requests themselves overlap."""
+
+    def __init__(self, min_interval_s: float):
+        self.min_interval_s = min_interval_s
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            now = asyncio.get_running_loop().time()
+            delay = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.min_interval_s
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
 class DiscogsService:
     def __init__(self):
         self.base_url = "https://api.discogs.com"
@@ -15,20 +51,38 @@ class DiscogsService:
             "key": settings.DISCOGS_API_KEY,
             "secret": settings.DISCOGS_API_SECRET
         }
+        self.rate_limiter = RateLimiter(DISCOGS_MIN_REQUEST_INTERVAL_S)
+        self._base_release_misses: dict[str, float] = {} # normalized query -> expiry (time.monotonic)
+        self._client: httpx.AsyncClient | None = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The shared HTTP client, so connections (and TLS sessions) to Discogs are reused between calls."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient()
+        return self._client
 
+    async def aclose(self) -> None:
+        """Closes the shared HTTP client. Called on app shutdown."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    @alru_cache(maxsize=RELEASE_CACHE_SIZE, ttl=RELEASE_CACHE_TTL_S)
     async def get_release(self, release_id: int) -> Dict[str, Any]:
         """
         Gets a single release from Discogs by its ID and performs initial data parsing.
         This method combines the logic from the old get_release and fetch_release_from_discogs.
+        Cached briefly, so concurrent fetches of the same release share one request.
         """
-        logger.info(f"DiscogsService: GET /releases/{release_id}")
+        logger.debug("DiscogsService: GET /releases/%s", release_id)
+        await self.rate_limiter.acquire()
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.base_url}/releases/{release_id}",
-                    headers=self.headers,
-                    params=self.params,
-                    timeout=30.0
+            response = await self.client.get(
+                f"{self.base_url}/releases/{release_id}",
+                headers=self.headers,
+                params=self.params,
+                timeout=30.0
             )
             response.raise_for_status() # Raises an exception for 4xx and 5xx responses
 
@@ -36,17 +90,18 @@ class DiscogsService:
             return response.json()
         
         except httpx.RequestError as e:
-            logger.error(f"Request error to DIscogs API: {e}")
+            logger.error("Request error to DIscogs API: %s", e)
             raise Exception(f"Faile to connect to Discogs API: {str(e)}")
         except httpx.HTTPStatusError as e:
-            logger.error(f"Discogs API returned status {e.response.status_code}: {e.response.text}")
+            logger.error("Discogs API returned status %s: %s", e.response.status_code, e.response.text)
             raise Exception(f"Discogs API error: {e.response.status_code}")
         except Exception as e:
-            logger.error(f"Unexpected error occurred in DiscogsService: {e}")
+            logger.error("Unexpected error occurred in DiscogsService: %s", e)
             raise
 
+    @alru_cache(maxsize=SEARCH_CACHE_SIZE, ttl=SEARCH_CACHE_TTL_S)
     async def search_releases(self, query: str, page: int = 1, per_page: int = 50) -> Dict[str, Any]:
-        """Search releases on Discogs"""
+        """Search releases on Discogs. Responses are cached, and concurrent identical searches share one request."""
         search_params = {
             **self.params,
             "q": query,
@@ -57,32 +112,77 @@ class DiscogsService:
         if per_page != 50:
             search_params["per_page"] = per_page
 
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(
-                    f"{self.base_url}/database/search",
-                    params=search_params,
-                    headers=self.headers
-                )
-                # Log rate limit headers regardless of status
-                logger.info(f"Discogs API Response Headers for query '{query}', page {page}:")
-                logger.info(f"  X-Discogs-Ratelimit: {response.headers.get('X-Discogs-Ratelimit')}")
-                logger.info(f"  X-Discogs-Ratelimit-Used: {response.headers.get('X-Discogs-Ratelimit-Used')}")
-                logger.info(f"  X-Discogs-Ratelimit-Remaining: {response.headers.get('X-Discogs-Ratelimit-Remaining')}")
-
-                response.raise_for_status()
-                data = response.json()
-                logger.info(f"Discogs API Pagination for query '{query}', page {page}: {data.get('pagination')}")
-                return data
-            except httpx.HTTPStatusError as e:
-                if e.response.status_code == 404:
-                    logger.warning(f"Discogs API returned 404 for query '{query}', page {page}. Assuming no more results. URL: {e.request.url}")
-                    return {}
-                logger.error(f"Discogs API HTTP error for query '{query}', page {page}: {e} URL: {e.request.url}")
-                raise # Re-raise other HTTP errors
+        await self.rate_limiter.acquire()
+        try:
+            response = await self.client.get(
+                f"{self.base_url}/database/search",
+                params=search_params,
+                headers=self.headers
+            )
+            # Log rate limit headers regardless of status
+            logger.debug(
+                "Discogs API rate limit for query '%s', page %s: limit=%s, used=%s, remaining=%s",
+                query, page,
+                response.headers.get("X-Discogs-Ratelimit"),
+                response.headers.get("X-Discogs-Ratelimit-Used"),
+                response.headers.get("X-Discogs-Ratelimit-Remaining"),
+            )
+
+            response.raise_for_status()
+            data = response.json()
+            logger.debug("Discogs API Pagination for query '%s', page %s: %s", query, page, data.get("pagination"))
+            return data
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 404:
+                logger.warning("Discogs API returned 404 for query '%s', page %s. Assuming no more results. URL: %s", query, page, e.request.url)
+                return {}
+            logger.error("Discogs API HTTP error for query '%s', page %s: %s URL: %s", query, page, e, e.request.url)
+            raise # Re-raise other HTTP errors
+
+    async def cached_base_release_lookup(self, track_title: str, artist_name: str | None) -> int | None:
+        """
+        Returns the Discogs ID of the most relevant release for a track, or None if nothing matched.
+        Matches and misses are both cached, keyed on the normalized query, so repeated seeds
+        (in any casing/spacing) don't spend a request (and a rate-limit token) each.
+        """
+        # Using a simpler query format. The 'field:"value"' syntax can be too strict.
+        # A general query with just the keywords is often more effective for finding a base release.
+        query_parts = [track_title]
+        if artist_name:
+            query_parts.append(artist_name)
+        query = " ".join(" ".join(query_parts).lower().split())
+
+        now = time.monotonic()
+        if self._base_release_misses.get(query, 0.0) > now:
+            return None
+        try:
+            return await self._lookup_base_release(query)
+        except LookupError:
+            if len(self._base_release_misses) >= BASE_RELEASE_LOOKUP_CACHE_SIZE:
+                self._base_release_misses.clear()
+            self._base_release_misses[query] = now + BASE_RELEASE_MISS_TTL_S
+            return None
+
+    @alru_cache(maxsize=BASE_RELEASE_LOOKUP_CACHE_SIZE, ttl=BASE_RELEASE_LOOKUP_TTL_S)
+    async def _lookup_base_release(self, query: str) -> int:
+        """Searches Discogs for the query and returns the first result's ID. Raises LookupError (not cached) on no match."""
+        logger.info("Searching Discogs with query: %s", query)
+        search_results = await self.search_releases(query=query)
+
+        if search_results and search_results.get("results"):
+            first_result = search_results["results"][0]
+            if "id" in first_result:
+                return first_result["id"]
+        raise LookupError(f"No Discogs release found for query '{query}'")
+
+# A single shared instance, so the lookup caches above are shared between requests.
+_discogs_service = DiscogsService()
 
 # Dependency
 async def get_discogs_service() -> DiscogsService:
     """Dependency injection for DiscogsService"""
-    return DiscogsService()
+    return _discogs_service
 
+async def close_discogs_service() -> None:
+    """Closes the shared DiscogsService's HTTP client (on app shutdown)."""
+    await _discogs_service.aclose()
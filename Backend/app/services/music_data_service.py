@@ -1,4 +1,6 @@
 import logging
+from typing import Any, Dict
+from sqlalchemy import or_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
@@ -10,86 +12,89 @@ from app.services.discogs import DiscogsService
 
 logger = logging.getLogger(__name__)
 
-async def get_or_create_artist(artist_data: dict, db: AsyncSession) -> Artist:
+async def get_or_create_artists(artists_data: list[dict], db: AsyncSession) -> list[Artist]:
+    """
+    Gets or creates the artists for artists_data (Discogs artist dicts), returning them in the same order.
+    Existing artists are found in a single query and the missing ones are created with a single flush.
+    """
+    if not artists_data:
+        return []
     # Treat a discogs_id of 0 as None (NULL in the database)
-    discogs_id = artist_data.get("id") if artist_data.get("id") != 0 else None
-
-    # 1. Try to find by Discogs ID if it's a valid, non-zero ID
-    if discogs_id:
-        stmt = select(Artist).where(Artist.discogs_id == discogs_id)
-        result = await db.execute(stmt)
-        db_artist = result.scalar_one_or_none()
-        if db_artist:
-            logger.debug(f"Found existing artist in DB by discogs_id={discogs_id}: {db_artist.name}")
-            return db_artist
-
-    # 2. If no valid Discogs ID or not found, try to find by name.
-    # This is crucial for artists with discogs_id=0 or for general data consistency.
-    stmt = select(Artist).where(Artist.name == artist_data.get("name"))
-    result = await db.execute(stmt)
-    db_artist = result.scalar_one_or_none()
-
-    if db_artist:
-        logger.debug(f"Found existing artist in DB by name: {db_artist.name}")
-        # If we found an artist by name that was missing a discogs_id, update it.
-        if not db_artist.discogs_id and discogs_id:
-            logger.debug(f"Updating artist '{db_artist.name}' with new discogs_id={discogs_id}")
-            db_artist.discogs_id = discogs_id
-            # The session will be flushed/committed by the calling function.
-        return db_artist
-
-    # 3. If not found by either, create a new artist.
-    logger.debug(f"Creating new artist: {artist_data.get('name')} with discogs_id={discogs_id}")
-    db_artist = Artist(name=artist_data.get("name"), discogs_id=discogs_id)
-    db.add(db_artist)
-    await db.flush()  # Use flush to get the ID before the transaction commits.
-    await db.refresh(db_artist)
-    return db_artist
-
-
-async def get_all_releases_with_details(db: AsyncSession) -> list[Release]:
-    """Fetches all releases from the DB, eager-loading their tracks and artists."""
-    stmt = select(Release).options(
-        selectinload(Release.tracks).selectinload(Track.artists),
-        selectinload(Release.artist)
+    discogs_ids = list({a.get("id") for a in artists_data if a.get("id")})
+    names = list({a.get("name") for a in artists_data})
+    result = await db.execute(
+        select(Artist).where(or_(Artist.discogs_id.in_(discogs_ids), Artist.name.in_(names)))
     )
+    by_discogs_id: dict[int, Artist] = {}
+    by_name: dict[str, Artist] = {}
+    for db_artist in result.scalars().all():
+        if db_artist.discogs_id:
+            by_discogs_id[db_artist.discogs_id] = db_artist
+        by_name[db_artist.name] = db_artist
+
+    artists: list[Artist] = []
+    created = False
+    for artist_data in artists_data:
+        discogs_id = artist_data.get("id") or None
+        name = artist_data.get("name")
+        # 1. Find by Discogs ID if it's a valid, non-zero ID
+        db_artist = by_discogs_id.get(discogs_id) if discogs_id else None
+        # 2. If no valid Discogs ID or not found, find by name.
+        # This is crucial for artists with discogs_id=0 or for general data consistency.
+        if db_artist is None:
+            db_artist = by_name.get(name)
+            # If we found an artist by name that was missing a discogs_id, update it.
+            if db_artist is not None and not db_artist.discogs_id and discogs_id:
+                logger.debug("Updating artist '%s' with new discogs_id=%s", db_artist.name, discogs_id)
+                db_artist.discogs_id = discogs_id
+                by_discogs_id[discogs_id] = db_artist
+        # 3. If not found by either, create a new artist.
+        if db_artist is None:
+            logger.debug("Creating new artist: %s with discogs_id=%s", name, discogs_id)
+            db_artist = Artist(name=name, discogs_id=discogs_id)
+            db.add(db_artist)
+            created = True
+            if discogs_id:
+                by_discogs_id[discogs_id] = db_artist
+            by_name[name] = db_artist
+        artists.append(db_artist)
+
+    if created:
+        await db.flush()  # Use flush to get the new IDs before the transaction commits.
+    return artists
+
+
+async def get_releases_by_discogs_ids(discogs_ids: list[int], db: AsyncSession) -> dict[int, Release]:
+    """
+    Fetches the releases already in the DB for the given Discogs IDs in a single query, keyed by discogs_id.
+    Only the release rows are loaded (no tracks or artists); load those separately for the releases you keep.
+    """
+    if not discogs_ids:
+        return {}
+    stmt = select(Release).where(Release.discogs_id.in_(discogs_ids))
     result = await db.execute(stmt)
-    return result.scalars().unique().all()
+    return {release.discogs_id: release for release in result.scalars().unique().all()}
 
 
-async def get_or_create_release_with_tracks(
+async def create_release_with_tracks(
     discogs_release_id: int,
-    db: AsyncSession,
-    discogs_service: DiscogsService
-) -> Release | None:
+    data: Dict[str, Any],
+    db: AsyncSession
+) -> Release:
     """
-    The main function to get a release from our DB or fetch it from Discogs,
-    including its primary artist and all its tracks with their artists.
+    Saves a release fetched from Discogs (the JSON returned by DiscogsService.get_release)
+    with its primary artist and all its tracks with their artists.
     """
     try:
-        # 1. Check DB for the release
-        result = await db.execute(
-            select(Release).options(
-                selectinload(Release.tracks).selectinload(Track.artists),
-                selectinload(Release.artist)
-            ).where(Release.discogs_id == discogs_release_id)
-        )
-        release = result.scalars().first()
-        if release:
-            logger.info(f"Found existing release in DB: {release.title}")
-            return release
+        tracks_data = [t for t in data.get("tracklist") or [] if t.get("type_") == "track"]
 
-        # 2. Fetch from Discogs API using the DiscogsService
-        logger.info(f"Fetching release {discogs_release_id} from Discogs API")
-        data = await discogs_service.get_release(discogs_release_id)
+        # 1. Get or create the primary artist and all track artists in one go
+        main_artists_data = data["artists"][:1] if data.get("artists") else []
+        track_artists_data = [a for t in tracks_data for a in t.get("artists") or []]
+        resolved_artists = iter(await get_or_create_artists(main_artists_data + track_artists_data, db))
+        main_artist_obj = next(resolved_artists) if main_artists_data else None
 
-        # 3. Get or create the primary artist for the release
-        main_artist_obj = None
-        if data.get("artists"):
-            main_artist_data = data["artists"][0]
-            main_artist_obj = await get_or_create_artist(main_artist_data, db)
-
-        # 4. Create the Release object
+        # 2. Create the Release object
         new_release = Release(
             discogs_id=discogs_release_id,
             title=data.get("title", "Unknown Title"),
@@ -101,33 +106,70 @@ async def get_or_create_release_with_tracks(
         db.add(new_release)
         await db.flush() # Flush to get the new_release.id
 
-        # 5. Create Track objects and link artists
-        if data.get("tracklist"):
-            for track_item in data["tracklist"]:
-                if track_item.get("type_") == "track":
-                    new_track = Track(
-                        title=track_item.get("title"),
-                        position=track_item.get("position"),
-                        release_id=new_release.id
-                    )
-                    # Link artists to the track
-                    if track_item.get("artists"):
-                        for track_artist_data in track_item["artists"]:
-                            track_artist_obj = await get_or_create_artist(track_artist_data, db)
-                            if track_artist_obj: # Ensure artist was found/created
-                                new_track.artists.append(track_artist_obj)
-                    elif main_artist_obj: # If no track-specific artists, link the main release artist
-                        new_track.artists.append(main_artist_obj)
-                    db.add(new_track)
+        # 3. Create Track objects and link artists
+        for track_item in tracks_data:
+            new_track = Track(
+                title=track_item.get("title"),
+                position=track_item.get("position"),
+                release_id=new_release.id
+            )
+            # Link artists to the track (resolved above, in the same order)
+            if track_item.get("artists"):
+                for _ in track_item["artists"]:
+                    new_track.artists.append(next(resolved_artists))
+            elif main_artist_obj: # If no track-specific artists, link the main release artist
+                new_track.artists.append(main_artist_obj)
+            db.add(new_track)
 
         await db.commit()
-        logger.info(f"Saved new release to database: ID={new_release.id}, Title='{new_release.title}'")
+        logger.debug("Saved new release to database: ID=%s, Title='%s'", new_release.id, new_release.title)
         return new_release
 
+    except Exception:
+        await db.rollback()
+        raise
+
+
+async def _load_release_with_tracks(discogs_release_id: int, db: AsyncSession) -> Release | None:
+    """Loads a release with its primary artist and all its tracks with their artists eager-loaded."""
+    result = await db.execute(
+        select(Release).options(
+            selectinload(Release.tracks).selectinload(Track.artists),
+            selectinload(Release.artist)
+        ).where(Release.discogs_id == discogs_release_id)
+        # A release saved in this session is already in the identity map, with its relationships unloaded
+        .execution_options(populate_existing=True)
+    )
+    return result.scalars().first()
+
+
+async def get_or_create_release_with_tracks(
+    discogs_release_id: int,
+    db: AsyncSession,
+    discogs_service: DiscogsService
+) -> Release | None:
+    """
+    The main function to get a release from our DB or fetch it from Discogs,
+    including its primary artist and all its tracks with their artists.
+    """
+    try:
+        # 1. Check DB for the release
+        release = await _load_release_with_tracks(discogs_release_id, db)
+        if release:
+            logger.debug("Found existing release in DB: %s", release.title)
+            return release
+
+        # 2. Fetch from Discogs API using the DiscogsService
+        logger.debug("Fetching release %s from Discogs API", discogs_release_id)
+        data = await discogs_service.get_release(discogs_release_id)
+
+        # 3. Save the release with its artist and tracks, then load it back with them in two more
+        # queries, so serializing it doesn't lazy-load the artist and each track's artists one by one.
+        await create_release_with_tracks(discogs_release_id, data, db)
+        return await _load_release_with_tracks(discogs_release_id, db)
+
     except Exception as e:
-        import traceback
-        logger.error(f"Error in get_or_create_release_with_tracks: {str(e)}")
-        logger.error(traceback.format_exc())
+        logger.exception("Error in get_or_create_release_with_tracks: %s", e)
         await db.rollback()
         raise
 
@@ -1,14 +1,23 @@
 import asyncio
+import heapq
 import logging
 from typing import List, Optional, Tuple
+from sqlalchemy import Float, Integer, String, bindparam, text
+from sqlalchemy.dialects.postgresql import ARRAY as PGARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
 
 from app.models.release import Release
 from app.models.track import Track
+from app.services.database import SessionLocal
 from app.services.discogs import DiscogsService
-from app.services.music_data_service import get_or_create_release_with_tracks, get_all_releases_with_details
+from app.services.music_data_service import (
+    create_release_with_tracks,
+    get_or_create_release_with_tracks,
+    get_releases_by_discogs_ids,
+)
+from app.services.similarity import DEFAULT_WEIGHTS, ReleaseFeatures, score_against_base, score_many
 from app.core.exceptions import NotFoundException
 from app.services.job_service import JobService
 from app.schemas.background_job import JobUpdate
@@ -22,7 +31,7 @@ logger = logging.getLogger(__name__)
 # --- Recommendation Service Constants ---
 # For Discogs search when finding *similar* releases (not the base release)
 DISCOGS_SIMILAR_SEARCH_PAGES = 1
-DISCOGS_SIMILAR_SEARCH_PER_PAGE = 50 # Discogs default is 50, max 100
+DISCOGS_SIMILAR_SEARCH_PER_PAGE = 100 # Discogs default is 50, max 100. One full page costs a single round trip
 
 # Minimum similarity score for a release to be considered a candidate for recommendations
 MIN_SCORE_FOR_CANDIDACY = 0.7
@@ -30,49 +39,60 @@ MIN_SCORE_FOR_CANDIDACY = 0.7
 # Default number of releases to fetch tracks from if not specified by the caller
 DEFAULT_LIMIT_RELEASES_FOR_TRACK_COLLECTION = 10
 
-# Weightings for similarity calculation (can be tuned)
-WEIGHT_STYLE = 4.0
-WEIGHT_LABEL = 2.5
-WEIGHT_YEAR = 2.5
-WEIGHT_ARTIST = 1.0
-STYLE_COMPLETENESS_BONUS = 2.0 # Bonus for having all base styles
-
-async def calculate_release_similarity(base_release: Release, target_release: Release) -> float:
-    """Calculates a similarity score between two releases using weighted factors and Jaccard similarity for styles."""
-    score = 0.0
-
-    # 1. Styles (Jaccard Similarity)
-    if base_release.styles and target_release.styles:
-        base_styles_set = set(s.lower() for s in base_release.styles)
-        target_styles_set = set(s.lower() for s in target_release.styles)
-        intersection = len(base_styles_set.intersection(target_styles_set))
-        union = len(base_styles_set.union(target_styles_set))
-        if union > 0:
-            jaccard_similarity = intersection / union
-            score += jaccard_similarity * WEIGHT_STYLE
-
-            # Add a bonus if all base styles are present in the target
-            if base_styles_set.issubset(target_styles_set):
-                score += STYLE_COMPLETENESS_BONUS
-
-    # 2. Label
-    if base_release.label and target_release.label and \
-    base_release.label.lower() == target_release.label.lower():
-        score += WEIGHT_LABEL
-
-    # 3. Year
-    if base_release.year and target_release.year:
-        year_diff = abs(base_release.year - target_release.year)
-        # Score diminishes as the year difference increases. Capped at 10 years diff.
-        year_score = max(0, 1 - (year_diff / 10.0))
-        score += year_score * WEIGHT_YEAR
-
-    # 4. Artist
-    if base_release.artist_id and target_release.artist_id and \
-       base_release.artist_id == target_release.artist_id:
-        score += WEIGHT_ARTIST
-
-    return score
+# Stop processing Discogs candidates once this many have scored above MIN_SCORE_FOR_CANDIDACY
+DISCOGS_CANDIDATES_TARGET = DEFAULT_LIMIT_RELEASES_FOR_TRACK_COLLECTION * 2
+
+# How many Discogs release fetches may be in flight at once while collecting candidates
+DISCOGS_FETCH_CONCURRENCY = 5
+
+# Scores and ranks the local catalog against a base release (same formula as similarity.build_scorer).
+# Built once at import, so the statement isn't re-parsed and its compiled form is reused across requests.
+_SIMILAR_RELEASES_STMT = text("""
+    SELECT scored.id, scored.score FROM (
+        SELECT r.id,
+            CASE WHEN s.target_pop > 0 AND :base_styles_pop > 0 THEN
+                CAST(s.intersection AS double precision)
+                    / (:base_styles_pop + s.target_pop - s.intersection) * :weight_style
+                + CASE WHEN s.intersection = :base_styles_pop THEN :style_bonus ELSE 0 END
+            ELSE 0 END
+            + CASE WHEN r.label_norm = :base_label THEN :weight_label ELSE 0 END
+            + CASE WHEN r.year <> 0 AND :base_year <> 0 THEN
+                greatest(0, 1 - abs(r.year - :base_year) / 10.0) * :weight_year
+            ELSE 0 END
+            + CASE WHEN r.artist_id = :base_artist_id THEN :weight_artist ELSE 0 END
+            AS score
+        FROM releases r
+        CROSS JOIN LATERAL (
+            SELECT count(*) FILTER (WHERE t.style = ANY(:base_styles)) AS intersection,
+                   count(*) AS target_pop
+            FROM (SELECT DISTINCT unnest(r.styles_norm) AS style) t
+        ) s
+        WHERE r.id <> :base_id
+            -- Prune to releases that can score at all: sharing no style, artist or label and being
+            -- 10+ years apart scores exactly 0. Each branch is served by an index on releases.
+            AND (
+                r.styles_norm && :base_styles
+                OR r.artist_id = :base_artist_id
+                OR r.label_norm = :base_label
+                OR (r.year BETWEEN :base_year - 9 AND :base_year + 9 AND r.year <> 0)
+            )
+    ) scored
+    WHERE scored.score > :min_score
+    ORDER BY scored.score DESC, scored.id
+    LIMIT :limit
+""").bindparams(
+    bindparam("base_styles", type_=PGARRAY(String)),
+    bindparam("base_styles_pop", type_=Integer),
+    bindparam("base_label", type_=String),
+    bindparam("base_year", type_=Integer),
+    bindparam("base_artist_id", type_=Integer),
+    bindparam("weight_style", type_=Float),
+    bindparam("style_bonus", type_=Float),
+    bindparam("weight_label", type_=Float),
+    bindparam("weight_year", type_=Float),
+    bindparam("weight_artist", type_=Float),
+    bindparam("min_score", type_=Float),
+)
 
 async def find_base_release_discogs_id_for_track(
     track_title: str,
@@ -80,55 +100,240 @@ async def find_base_release_discogs_id_for_track(
     discogs_service: DiscogsService
 ) -> int:
     """Searches Discogs and returns the Discogs ID of the most relevant release for a track."""
-    # Using a simpler query format. The 'field:"value"' syntax can be too strict.
-    # A general query with just the keywords is often more effective for finding a base release.
-    query_parts = [track_title]
-    if artist_name:
-        query_parts.append(artist_name)
-    query = " ".join(query_parts)
-    logger.info(f"Searching Discogs with query: {query}")
-    search_results = await discogs_service.search_releases(query=query)
-
-    if search_results and search_results.get("results"):
-        first_result = search_results["results"][0]
-        if "id" in first_result:
-            logger.info(f"Found potential base release on Discogs with ID: {first_result['id']}")
-            return first_result["id"]
-            
+    discogs_id = await discogs_service.cached_base_release_lookup(track_title, artist_name)
+    if discogs_id is not None:
+        logger.info("Found potential base release on Discogs with ID: %s", discogs_id)
+        return discogs_id
+
     raise NotFoundException(resource="Discogs release for track", resource_id=track_title)
 
-async def find_similar_releases_in_db(base_release: Release, db: AsyncSession, min_score_threshold: float) -> List[Tuple[Release, float]]:
-    """Finds releases in the local DB similar to the base_release, with score > 0.6."""
-    logger.info(f"LOCAL DB SEARCH: For releases similar to '{base_release.title}' (ID: {base_release.id}).")
-    all_db_releases = await get_all_releases_with_details(db)
+async def find_similar_releases_in_db(
+    base_release: Release,
+    db: AsyncSession,
+    min_score_threshold: float,
+    limit: int = DEFAULT_LIMIT_RELEASES_FOR_TRACK_COLLECTION,
+) -> List[Tuple[Release, float]]:
+    """Finds the top `limit` releases in the local DB similar to the base_release, with score > min_score_threshold.
+    The score is computed by the database (same formula as similarity.build_scorer), so only the winners are loaded."""
+    logger.info("LOCAL DB SEARCH: For releases similar to '%s' (ID: %s).", base_release.title, base_release.id)
+    base_feats = ReleaseFeatures.from_release(base_release)
+
+    # Phase 1: score the catalog in one query and only return the top IDs.
+    scored_rows = (await db.execute(
+        _SIMILAR_RELEASES_STMT,
+        {
+            "base_id": base_release.id,
+            "base_styles": list(base_release.styles_lower),
+            "base_styles_pop": base_feats.styles_pop,
+            "base_label": base_feats.label_lower,
+            "base_year": base_feats.year or None,
+            "base_artist_id": base_feats.artist_id,
+            "weight_style": DEFAULT_WEIGHTS.style,
+            "style_bonus": DEFAULT_WEIGHTS.style_completeness_bonus,
+            "weight_label": DEFAULT_WEIGHTS.label,
+            "weight_year": DEFAULT_WEIGHTS.year,
+            "weight_artist": DEFAULT_WEIGHTS.artist,
+            "min_score": min_score_threshold,
+            "limit": limit,
+        },
+    )).all()
+
+    if not scored_rows:
+        logger.info("LOCAL DB SEARCH: Found 0 releases with score > %s.", min_score_threshold)
+        return []
+
+    # Phase 2: load only the winning releases.
+    scores_by_id = {row.id: row.score for row in scored_rows}
+    result = await db.execute(select(Release).where(Release.id.in_(scores_by_id)))
+    releases_by_id = {release.id: release for release in result.scalars().all()}
 
     similar_db_releases_with_scores: List[Tuple[Release, float]] = []
-    for target_release in all_db_releases:
-        # Exclude the base release itself from the comparison
-        if target_release.id == base_release.id:
+    for release_id, score in scores_by_id.items():
+        target_release = releases_by_id[release_id]
+        logger.debug("  Local DB: '%s' (ID: %s) similarity: %.2f", target_release.title, target_release.id, score)
+        similar_db_releases_with_scores.append((target_release, score))
+
+    logger.info("LOCAL DB SEARCH: Found %d releases with score > %s.", len(similar_db_releases_with_scores), min_score_threshold)
+
+    return similar_db_releases_with_scores
+
+async def search_discogs_candidates(base_release: Release, discogs_service: DiscogsService) -> List[dict]:
+    """Searches Discogs for releases sharing the base release's styles and returns the raw search results."""
+    # STEP 2.1: Discogs Search for Similar Releases (Primary Source)
+    logger.info("STEP 2.1: Querying Discogs for similar releases based on base release style(s).")
+    raw_discogs_search_results = []
+    if not base_release.styles:
+        logger.warning("  Base release has no styles. Skipping Discogs style-based search for similar releases.")
+        return raw_discogs_search_results
+
+    # If a release has more than 3 styles, use only the first 3 to avoid an overly restrictive query.
+    styles_to_query = base_release.styles
+    if len(styles_to_query) > 3:
+        logger.info("  Release has %d styles. Using the first 3 for the Discogs query.", len(styles_to_query))
+        styles_to_query = styles_to_query[:3]
+
+    style_queries = [f'style:"{style}"' for style in styles_to_query]
+    
+    # Combine all style queries for the search.
+    # NOTE: Genre is intentionally omitted as Postman tests showed it overly restricts results.
+    discogs_query = " ".join(style_queries)
+    logger.info("  Discogs query: %s", discogs_query)
+
+    try:
+        search_pages = [await discogs_service.search_releases(
+            query=discogs_query, page=1, per_page=DISCOGS_SIMILAR_SEARCH_PER_PAGE
+        )]
+    except Exception as e:
+        logger.error("  Error fetching page 1 from Discogs: %s", e, exc_info=False)
+        return raw_discogs_search_results
+
+    # Only request the further pages Discogs says exist, and request them together rather than one by one.
+    available_pages = (search_pages[0] or {}).get("pagination", {}).get("pages", 1)
+    page_nums = range(2, min(DISCOGS_SIMILAR_SEARCH_PAGES, available_pages) + 1)
+    more_pages = await asyncio.gather(
+        *(discogs_service.search_releases(query=discogs_query, page=page_num, per_page=DISCOGS_SIMILAR_SEARCH_PER_PAGE)
+          for page_num in page_nums),
+        return_exceptions=True,
+    )
+    for page_num, search_page_data in zip(page_nums, more_pages):
+        if isinstance(search_page_data, Exception):
+            logger.error("  Error fetching page %d from Discogs: %s", page_num, search_page_data, exc_info=False)
             continue
+        search_pages.append(search_page_data)
+
+    for search_page_data in search_pages:
+        if search_page_data and search_page_data.get("results"):
+            raw_discogs_search_results.extend(search_page_data["results"])
+    
+    logger.info("  Found %d raw candidate items from Discogs style search.", len(raw_discogs_search_results))
+
+    if raw_discogs_search_results and logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Raw candidates from Discogs (before local DB check/processing):")
+        for cand_data in raw_discogs_search_results:
+            logger.debug(
+                "  - Title: %s, Discogs ID: %s, Styles: %s, Year: %s, Label: %s",
+                cand_data.get("title"), cand_data.get("id"), cand_data.get("style"), cand_data.get("year"), cand_data.get("label"),
+            )
+
+    return raw_discogs_search_results
 
 
-        score = await calculate_release_similarity(base_release, target_release)
-        if score > min_score_threshold: 
-            logger.debug(f"  Local DB: '{target_release.title}' (ID: {target_release.id}) similarity: {score:.2f}")
-            similar_db_releases_with_scores.append((target_release, score))
+async def collect_discogs_candidates(
+    base_release: Release,
+    raw_discogs_search_results: List[dict],
+    db: AsyncSession,
+    discogs_service: DiscogsService,
+) -> dict[int, Tuple[Release, float]]:
+    """Gets/creates the Discogs search results in the local DB and scores them against the base release.
+    Returns (Release, score) tuples keyed by local release ID."""
+    # STEP 2.2: Process Discogs candidates: get/create them in local DB and calculate scores
+    logger.info("STEP 2.2: Processing Discogs candidates.")
+    discogs_candidates: dict[int, Tuple[Release, float]] = {}
+    if not raw_discogs_search_results:
+        return discogs_candidates
+
+    # Bulk-prefetch the candidates we already have locally, so only the misses cost a round-trip.
+    candidate_discogs_ids = [r["id"] for r in raw_discogs_search_results if r.get("id")]
+    existing_releases = await get_releases_by_discogs_ids(candidate_discogs_ids, db)
+    logger.info("  %d of %d Discogs candidates already in local DB.", len(existing_releases), len(candidate_discogs_ids))
+    base_feats = ReleaseFeatures.from_release(base_release)
+
+    # Process the most promising candidates first, using a preliminary score from the metadata already
+    # in the search results, so we can stop before spending rate-limited requests on obviously weak ones.
+    preliminary_scores = score_many(
+        base_feats, [ReleaseFeatures.from_search_result(r) for r in raw_discogs_search_results]
+    )
+    prioritized_search_results = [
+        r for _, r in sorted(
+            zip(preliminary_scores, raw_discogs_search_results), key=lambda item: item[0], reverse=True
+        )
+    ]
+
+    # Discogs IDs already handled (the base release included), so repeated search hits are skipped in O(1).
+    seen_discogs_ids: set[int] = {base_release.discogs_id}
+    ordered_discogs_ids: List[int] = []
+    for raw_release_data in prioritized_search_results:
+        discogs_id = raw_release_data.get("id")
+        if not discogs_id or discogs_id in seen_discogs_ids:
+            continue # Skip self, duplicates or items without ID
+        seen_discogs_ids.add(discogs_id)
+        ordered_discogs_ids.append(discogs_id)
+
+    # Fetch the misses from Discogs concurrently, keeping up to DISCOGS_FETCH_CONCURRENCY fetches in flight
+    # ahead of the candidate being processed (DiscogsService spaces out the request starts to stay within
+    # the rate limit). Saving and scoring stay sequential and in priority order, since the session can't be
+    # shared between concurrent tasks.
+    # At most as many fetches are started as candidates are still needed, so reaching the target doesn't
+    # leave requests we won't use behind: get_release is cached, and cancelling one of its callers doesn't
+    # stop the shared request (or give back its rate-limit slot).
+    misses = [discogs_id for discogs_id in ordered_discogs_ids if discogs_id not in existing_releases]
+    next_miss = 0
+    pending_fetches: dict[int, asyncio.Task] = {}
+    try:
+        for discogs_id in ordered_discogs_ids:
+            if len(discogs_candidates) >= DISCOGS_CANDIDATES_TARGET:
+                logger.info("  Collected %d Discogs candidates. Skipping the remaining lower-ranked results.", len(discogs_candidates))
+                break
 
-    similar_db_releases_with_scores.sort(key=lambda x: x[1], reverse=True)
+            fetch_window = min(DISCOGS_FETCH_CONCURRENCY, DISCOGS_CANDIDATES_TARGET - len(discogs_candidates))
+            while next_miss < len(misses) and len(pending_fetches) < fetch_window:
+                pending_fetches[misses[next_miss]] = asyncio.create_task(discogs_service.get_release(misses[next_miss]))
+                next_miss += 1
 
-    logger.info(f"LOCAL DB SEARCH: Found {len(similar_db_releases_with_scores)} releases with score > {min_score_threshold}.")
+            try:
+                release_obj = existing_releases.get(discogs_id)
+                if release_obj is None:
+                    data = await pending_fetches.pop(discogs_id)
+                    release_obj = await create_release_with_tracks(discogs_id, data, db)
+                score = score_against_base(base_feats, ReleaseFeatures.from_release(release_obj))
+                if score >= MIN_SCORE_FOR_CANDIDACY:
+                    discogs_candidates[release_obj.id] = (release_obj, score)
+                    logger.debug("    Added Discogs candidate '%s' (Local ID: %s), Score: %.2f", release_obj.title, release_obj.id, score)
+            except Exception as e:
+                logger.warning("    Error processing Discogs candidate ID %s (e.g. release details fetch failed): %s", discogs_id, e, exc_info=False)
+    finally:
+        # Only reached with fetches pending when the loop is left early (e.g. the request was cancelled),
+        # or when local releases filled the target first. This stops waiting on them; a request that was
+        # already sent still completes and counts against the rate limit.
+        for fetch in pending_fetches.values():
+            fetch.cancel()
+        await asyncio.gather(*pending_fetches.values(), return_exceptions=True)
 
-    return similar_db_releases_with_scores
+    return discogs_candidates
 
-async def get_track_recommendations(
+
+async def find_discogs_candidates(
+    base_release: Release,
+    db: AsyncSession,
+    discogs_service: DiscogsService,
+) -> dict[int, Tuple[Release, float]]:
+    """Searches Discogs for releases similar to the base release, then gets/creates and scores them (step 2)."""
+    raw_discogs_search_results = await search_discogs_candidates(base_release, discogs_service)
+    return await collect_discogs_candidates(base_release, raw_discogs_search_results, db, discogs_service)
+
+
+async def collect_local_candidates(base_release: Release) -> List[Tuple[Release, float]]:
+    """Scores the local DB against the base release.
+    Runs concurrently with find_discogs_candidates, which is using the request's session,
+    and an AsyncSession can't be shared between concurrent tasks, so this opens its own."""
+    # STEP 3: Local DB Search for Additional/Enriching Similar Releases
+    logger.info("STEP 3: Searching local DB for additional/enriching similar releases.")
+    async with SessionLocal() as local_db:
+        # We pass MIN_SCORE_FOR_CANDIDACY to ensure consistent filtering with the Discogs candidates.
+        return await find_similar_releases_in_db(
+            base_release, local_db, min_score_threshold=MIN_SCORE_FOR_CANDIDACY
+        )
+
+
+async def get_recommended_release_ids(
     db: AsyncSession,
     discogs_service: DiscogsService,
     track_title: str,
     artist_name: Optional[str] = None,
-) -> List[Track]:
-    """Generates track recommendations based on a seed track.
+) -> List[int]:
+    """Finds the local IDs of the top releases similar to the seed track's release.
     Prioritizes Discogs for discovering similar releases, then enriches with local DB data."""
-    logger.info(f"RECOMMENDATION PIPELINE for '{track_title}' by '{artist_name}': START")
+    logger.info("RECOMMENDATION PIPELINE for '%s' by '%s': START", track_title, artist_name)
 
     # STEP 1: Identify and fetch base release (unchanged)
     logger.info("STEP 1.1: Identifying Discogs ID for base release.")
@@ -137,115 +342,73 @@ async def get_track_recommendations(
             track_title, artist_name, discogs_service
         )
     except NotFoundException:
-        logger.warning(f"Could not find base release on Discogs for '{track_title}'. Aborting.")
+        logger.warning("Could not find base release on Discogs for '%s'. Aborting.", track_title)
         return []
     
-    logger.info(f"STEP 1.2: Getting/creating base release (Discogs ID: {base_release_discogs_id}) in local DB.")
-    base_release = await get_or_create_release_with_tracks(base_release_discogs_id, db, discogs_service)
+    logger.info("STEP 1.2: Getting/creating base release (Discogs ID: %s) in local DB.", base_release_discogs_id)
+    # Scoring only reads the release's own columns, so a base release that's already local is loaded
+    # without the track/artist graph that get_or_create_release_with_tracks eager-loads for the API.
+    base_release = (await get_releases_by_discogs_ids([base_release_discogs_id], db)).get(base_release_discogs_id)
+    if base_release is None:
+        base_release = await get_or_create_release_with_tracks(base_release_discogs_id, db, discogs_service)
     if not base_release:
-        logger.error(f"Failed to get or create base_release with Discogs ID {base_release_discogs_id}. Aborting.")
+        logger.error("Failed to get or create base_release with Discogs ID %s. Aborting.", base_release_discogs_id)
         return []
-    logger.info(f"  Base release: '{base_release.title}' (Local ID: {base_release.id}, Styles: {base_release.styles})")
+    logger.info("  Base release: '%s' (Local ID: %s, Styles: %s)", base_release.title, base_release.id, base_release.styles)
 
     # --- Candidate Collection --- 
+    # Steps 2 (Discogs, IO-bound) and 3 (local DB) only depend on the base release, so the local scan
+    # runs while we wait on the Discogs search and fetches. A release both find has the same score either
+    # way, and the merge below keeps one entry per release.
+    discogs_task = asyncio.create_task(find_discogs_candidates(base_release, db, discogs_service))
+    local_task = asyncio.create_task(collect_local_candidates(base_release))
+    try:
+        discogs_candidates, local_db_candidates = await asyncio.gather(discogs_task, local_task)
+    except BaseException:
+        # gather doesn't stop the other branch when one fails. The Discogs branch uses the request's
+        # session, so stop it and wait for it before the caller uses that session to handle the error.
+        for task in (discogs_task, local_task):
+            task.cancel()
+        await asyncio.gather(discogs_task, local_task, return_exceptions=True)
+        raise
+
     # Using a dictionary keyed by local release.id to automatically handle de-duplication.
     # Stores (Release, score) tuples.
-    all_candidates_map: dict[int, Tuple[Release, float]] = {}
+    all_candidates_map: dict[int, Tuple[Release, float]] = dict(discogs_candidates)
 
-    # STEP 2: Discogs Search for Similar Releases (Primary Source)
-    logger.info("STEP 2: Querying Discogs for similar releases based on base release style(s).")
-    raw_discogs_search_results = []
-    if base_release.styles:
-        # If a release has more than 3 styles, use only the first 3 to avoid an overly restrictive query.
-        styles_to_query = base_release.styles
-        if len(styles_to_query) > 3:
-            logger.info(f"  Release has {len(styles_to_query)} styles. Using the first 3 for the Discogs query.")
-            styles_to_query = styles_to_query[:3]
-
-        style_queries = [f'style:"{style}"' for style in styles_to_query]
-        
-        # Combine all style queries for the search.
-        # NOTE: Genre is intentionally omitted as Postman tests showed it overly restricts results.
-        discogs_query = " ".join(style_queries)
-        logger.info(f"  Discogs query: {discogs_query}")
-
-        for page_num in range(1, DISCOGS_SIMILAR_SEARCH_PAGES + 1):
-            try:
-                search_page_data = await discogs_service.search_releases(
-                    query=discogs_query, page=page_num, per_page=DISCOGS_SIMILAR_SEARCH_PER_PAGE
-                )
-                if search_page_data and search_page_data.get("results"):
-                    raw_discogs_search_results.extend(search_page_data["results"])
-                # Stop if no more pages indicated by Discogs
-                if not (search_page_data and search_page_data.get("pagination", {}).get("urls", {}).get("next")):
-                    break
-            except Exception as e:
-                logger.error(f"  Error fetching page {page_num} from Discogs: {e}", exc_info=False)
-                break # Stop trying if a page fetch fails
-        
-        logger.info(f"  Found {len(raw_discogs_search_results)} raw candidate items from Discogs style search.")
-
-        if raw_discogs_search_results:
-            logger.info("Raw candidates from Discogs (before local DB check/processing):")
-            for cand_data in raw_discogs_search_results:
-                logger.info(f"  - Title: {cand_data.get('title')}, Discogs ID: {cand_data.get('id')}, Styles: {cand_data.get('style')}, Year: {cand_data.get('year')}, Label: {cand_data.get('label')}")
-
-    # Process Discogs candidates: get/create them in local DB and calculate scores
-        for raw_release_data in raw_discogs_search_results:
-            discogs_id = raw_release_data.get("id")
-            if not discogs_id or discogs_id == base_release.discogs_id:
-                continue # Skip self or items without ID
-
-            try:
-                # This ensures the release is in our DB and details are loaded for scoring.
-                release_obj = await get_or_create_release_with_tracks(discogs_id, db, discogs_service)
-                if release_obj and release_obj.id not in all_candidates_map: # Check if already processed
-                    score = await calculate_release_similarity(base_release, release_obj)
-                    if score >= MIN_SCORE_FOR_CANDIDACY:
-                        all_candidates_map[release_obj.id] = (release_obj, score)
-                        logger.debug(f"    Added Discogs candidate '{release_obj.title}' (Local ID: {release_obj.id}), Score: {score:.2f}")
-            except Exception as e:
-                logger.warning(f"    Error processing Discogs candidate ID {discogs_id} (e.g. release details fetch failed): {e}", exc_info=False)
-
-            # Add a delay to respect Discogs API rate limits (60/min -> ~1/sec)
-            await asyncio.sleep(1.1)
-    else:
-        logger.warning("  Base release has no styles. Skipping Discogs style-based search for similar releases.")
-
-    # STEP 3: Local DB Search for Additional/Enriching Similar Releases
-    logger.info("STEP 3: Searching local DB for additional/enriching similar releases.")
-    # find_similar_releases_in_db returns List[Tuple[Release, float]] already scored and filtered by its threshold.
-    # We pass MIN_SCORE_FOR_CANDIDACY to ensure consistent filtering.
-    local_db_candidates = await find_similar_releases_in_db(base_release, db, min_score_threshold=MIN_SCORE_FOR_CANDIDACY)
-    
-    logger.info(f"  Found {len(local_db_candidates)} candidates from local DB with score >= {MIN_SCORE_FOR_CANDIDACY}.")
+    logger.info("  Found %d candidates from local DB with score >= %s.", len(local_db_candidates), MIN_SCORE_FOR_CANDIDACY)
     for rel_obj, score in local_db_candidates:
         if rel_obj.id not in all_candidates_map: # Add if not already present from Discogs search
             all_candidates_map[rel_obj.id] = (rel_obj, score)
-            logger.debug(f"    Added Local DB candidate '{rel_obj.title}' (Local ID: {rel_obj.id}), Score: {score:.2f}")
-        # If already present, the one from Discogs (potentially fresher) or first one encountered is kept.
-        # Current map logic will keep the first one encountered if IDs are the same.
+            logger.debug("    Added Local DB candidate '%s' (Local ID: %s), Score: %.2f", rel_obj.title, rel_obj.id, score)
+        # If already present, the one from Discogs (potentially fresher) is kept.
 
     # STEP 4: Consolidate, Sort, and Limit Final Candidates
     logger.info("STEP 4: Consolidating, sorting, and limiting final candidates.")
-    consolidated_candidates_with_scores = list(all_candidates_map.values())
-    
-    # Sort all collected candidates by score
-    consolidated_candidates_with_scores.sort(key=lambda item: item[1], reverse=True)
-    
-    # Limit to the number of releases requested for track collection
-    top_releases_with_scores = consolidated_candidates_with_scores[:DEFAULT_LIMIT_RELEASES_FOR_TRACK_COLLECTION]
-    logger.info(f"  Limiting to top {len(top_releases_with_scores)} of {len(consolidated_candidates_with_scores)} candidates for track extraction.")
+    # Only the top releases are used for track collection, so select them with a bounded heap instead of sorting everything
+    top_releases_with_scores = heapq.nlargest(
+        DEFAULT_LIMIT_RELEASES_FOR_TRACK_COLLECTION, all_candidates_map.values(), key=lambda item: item[1]
+    )
+    logger.info("  Limiting to top %d of %d candidates for track extraction.", len(top_releases_with_scores), len(all_candidates_map))
+
+    return [rel.id for rel, score in top_releases_with_scores]
+
+
+async def get_track_recommendations(
+    db: AsyncSession,
+    discogs_service: DiscogsService,
+    track_title: str,
+    artist_name: Optional[str] = None,
+) -> List[Track]:
+    """Generates track recommendations based on a seed track, with artists and release loaded."""
+    top_release_ids = await get_recommended_release_ids(db, discogs_service, track_title, artist_name)
 
     # STEP 5: Collect and Eagerly Load Tracks from Final Releases
-    logger.info(f"STEP 5: Collecting and eagerly loading tracks from top {len(top_releases_with_scores)} releases.")
-    
-    if not top_releases_with_scores:
+    logger.info("STEP 5: Collecting and eagerly loading tracks from top %d releases.", len(top_release_ids))
+    if not top_release_ids:
         logger.info("  No top releases found, returning empty list of tracks.")
         return []
 
-    top_release_ids = [rel.id for rel, score in top_releases_with_scores]
-    
     # A single query to get all tracks from the top releases, with their artists and parent release loaded.
     # This is crucial for the API response schema to work correctly without N+1 queries.
     stmt = (
@@ -260,10 +423,32 @@ async def get_track_recommendations(
     result = await db.execute(stmt)
     recommended_tracks = result.scalars().all()
     
-    logger.info(f"RECOMMENDATION PIPELINE: END. Collected {len(recommended_tracks)} tracks from {len(top_releases_with_scores)} releases.")
+    logger.info("RECOMMENDATION PIPELINE: END. Collected %d tracks from %d releases.", len(recommended_tracks), len(top_release_ids))
     return recommended_tracks
 
 
+async def get_recommended_track_ids(
+    db: AsyncSession,
+    discogs_service: DiscogsService,
+    track_title: str,
+    artist_name: Optional[str] = None,
+) -> List[int]:
+    """Same as get_track_recommendations, but only selects the track IDs (no ORM objects are hydrated)."""
+    top_release_ids = await get_recommended_release_ids(db, discogs_service, track_title, artist_name)
+
+    logger.info("STEP 5: Collecting track IDs from top %d releases.", len(top_release_ids))
+    if not top_release_ids:
+        logger.info("  No top releases found, returning empty list of track IDs.")
+        return []
+
+    stmt = select(Track.id).where(Track.release_id.in_(top_release_ids))
+    result = await db.execute(stmt)
+    track_ids = result.scalars().all()
+
+    logger.info("RECOMMENDATION PIPELINE: END. Collected %d track IDs from %d releases.", len(track_ids), len(top_release_ids))
+    return track_ids
+
+
 async def run_recommendation_pipeline_and_update_job(
     job_id: uuid.UUID,
     db: AsyncSession,
@@ -273,23 +458,21 @@ async def run_recommendation_pipeline_and_update_job(
 ):
     """Runs the full recommendation pipeline and updates the job status and result."""
     job_service = JobService(db)
-    logger.info(f"[Job ID: {job_id}] Starting recommendation pipeline.")
+    logger.info("[Job ID: %s] Starting recommendation pipeline.", job_id)
     start_time = datetime.datetime.now(datetime.timezone.utc)
 
     await job_service.update_job(job_id, JobUpdate(status=JobStatus.RUNNING, started_at=start_time))
 
     try:
-        recommended_tracks = await get_track_recommendations(
+        track_ids = await get_recommended_track_ids(
             db=db,
             discogs_service=discogs_service,
             track_title=track_title,
             artist_name=artist_name,
         )
-
-        track_ids = [track.id for track in recommended_tracks]
         end_time = datetime.datetime.now(datetime.timezone.utc)
         duration = (end_time - start_time).total_seconds()
-        logger.info(f"[Job ID: {job_id}] Pipeline completed successfully in {duration:.2f}s. Found {len(track_ids)} tracks.")
+        logger.info("[Job ID: %s] Pipeline completed successfully in %.2fs. Found %d tracks.", job_id, duration, len(track_ids))
         
         await job_service.update_job(
             job_id,
@@ -305,7 +488,7 @@ async def run_recommendation_pipeline_and_update_job(
         end_time = datetime.datetime.now(datetime.timezone.utc)
         duration = (end_time - start_time).total_seconds()
         error_message = f"An unexpected error occurred: {str(e)}"
-        logger.error(f"[Job ID: {job_id}] Pipeline failed after {duration:.2f}s. Error: {error_message}", exc_info=True)
+        logger.error("[Job ID: %s] Pipeline failed after %.2fs. Error: %s", job_id, duration, error_message, exc_info=True)
         await job_service.update_job(
             job_id,
             JobUpdate(
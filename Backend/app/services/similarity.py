@@ -0,0 +1,155 @@
+# Fully typed and free of imports from the rest of the app, so this module can be compiled
+# on its own with mypyc (see the README). It runs unchanged as plain Python too.
+from __future__ import annotations
+
+import functools
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, List, Protocol
+
+
+class ReleaseLike(Protocol):
+    """The release attributes the scorer reads. app.models.release.Release provides them."""
+    styles_lower: frozenset[str]
+    label_norm: str | None
+    year: int | None
+    artist_id: int | None
+
+
+@dataclass(frozen=True, slots=True)
+class Weights:
+    """Weightings for the similarity score (can be tuned)."""
+    style: float = 4.0
+    label: float = 2.5
+    year: float = 2.5
+    artist: float = 1.0
+    style_completeness_bonus: float = 2.0 # Bonus for having all base styles
+
+DEFAULT_WEIGHTS = Weights()
+
+# Bit position of every (lowercased) style seen by this process. Discogs styles are a fixed vocabulary of
+# a few hundred, so a style set fits in one int and set intersection/union become & / | plus bit_count().
+# The positions are only meaningful within the process; nothing is persisted.
+_STYLE_BITS: dict[str, int] = {}
+
+@functools.lru_cache(maxsize=65_536)
+def style_mask(styles_lower: frozenset[str]) -> int:
+    """Encodes a set of lowercased styles as a bitmask over _STYLE_BITS."""
+    mask = 0
+    for style in styles_lower:
+        bit = _STYLE_BITS.get(style)
+        if bit is None:
+            bit = _STYLE_BITS[style] = len(_STYLE_BITS)
+        mask |= 1 << bit
+    return mask
+
+@dataclass(frozen=True, slots=True)
+class ReleaseFeatures:
+    """The normalized fields of a release that the similarity score is computed from."""
+    styles_mask: int
+    styles_pop: int
+    label_lower: str | None
+    year: int | None
+    artist_id: int | None
+
+    @classmethod
+    def from_release(cls, release: ReleaseLike) -> ReleaseFeatures:
+        # label_norm/styles_norm are lowercased when the release is written, and the model
+        # keeps a per-instance frozenset of the styles, so nothing to normalize here.
+        return cls(
+            styles_mask=style_mask(release.styles_lower),
+            styles_pop=len(release.styles_lower),
+            label_lower=release.label_norm,
+            year=release.year,
+            artist_id=release.artist_id,
+        )
+
+    @classmethod
+    def from_search_result(cls, search_result: dict[str, Any]) -> ReleaseFeatures:
+        """Builds features from a raw Discogs search result. These don't carry a local artist_id."""
+        styles_lower = frozenset(s.lower() for s in search_result.get("style") or ())
+        labels = search_result.get("label") or []
+        year = str(search_result.get("year") or "")
+        return cls(
+            styles_mask=style_mask(styles_lower),
+            styles_pop=len(styles_lower),
+            label_lower=labels[0].lower() if labels else None,
+            year=int(year) if year.isdigit() else None,
+            artist_id=None,
+        )
+
+def _style_scorer(base_styles_mask: int, base_styles_pop: int, weights: Weights) -> Callable[[ReleaseFeatures], float]:
+    def score(target_feats: ReleaseFeatures) -> float:
+        # Jaccard similarity of the style sets
+        if not target_feats.styles_pop:
+            return 0.0
+        intersection = (base_styles_mask & target_feats.styles_mask).bit_count()
+        union = base_styles_pop + target_feats.styles_pop - intersection
+        style_score = (intersection / union) * weights.style
+        # Add a bonus if all base styles are present in the target
+        if intersection == base_styles_pop:
+            style_score += weights.style_completeness_bonus
+        return style_score
+    return score
+
+def _label_scorer(base_label: str, weights: Weights) -> Callable[[ReleaseFeatures], float]:
+    def score(target_feats: ReleaseFeatures) -> float:
+        return weights.label if target_feats.label_lower == base_label else 0.0
+    return score
+
+# Year score by year difference. It diminishes as the difference increases, down to 0 at 10+ years,
+# so differences past the end of the table all score 0.
+_YEAR_SCORE: tuple[float, ...] = tuple(max(0, 1 - (year_diff / 10.0)) for year_diff in range(10))
+
+def _year_scorer(base_year: int, weights: Weights) -> Callable[[ReleaseFeatures], float]:
+    weighted_year_score = tuple(year_score * weights.year for year_score in _YEAR_SCORE)
+
+    def score(target_feats: ReleaseFeatures) -> float:
+        if not target_feats.year:
+            return 0.0
+        year_diff = abs(base_year - target_feats.year)
+        return weighted_year_score[year_diff] if year_diff < len(weighted_year_score) else 0.0
+    return score
+
+def _artist_scorer(base_artist_id: int, weights: Weights) -> Callable[[ReleaseFeatures], float]:
+    def score(target_feats: ReleaseFeatures) -> float:
+        return weights.artist if target_feats.artist_id == base_artist_id else 0.0
+    return score
+
+@functools.lru_cache(maxsize=1024)
+def build_scorer(base_feats: ReleaseFeatures, weights: Weights = DEFAULT_WEIGHTS) -> Callable[[ReleaseFeatures], float]:
+    """Builds a scoring function specialized for one base release.
+    Factors the base release doesn't have (no styles, label, year or artist) can never score,
+    so they are left out entirely instead of being re-checked for every target."""
+    parts: List[Callable[[ReleaseFeatures], float]] = []
+    if base_feats.styles_pop:
+        parts.append(_style_scorer(base_feats.styles_mask, base_feats.styles_pop, weights))
+    if base_feats.label_lower:
+        parts.append(_label_scorer(base_feats.label_lower, weights))
+    if base_feats.year:
+        parts.append(_year_scorer(base_feats.year, weights))
+    if base_feats.artist_id:
+        parts.append(_artist_scorer(base_feats.artist_id, weights))
+
+    def score(target_feats: ReleaseFeatures) -> float:
+        total = 0.0
+        for part in parts:
+            total += part(target_feats)
+        return total
+    return score
+
+def score_many(
+    base_feats: ReleaseFeatures, targets: Iterable[ReleaseFeatures], weights: Weights = DEFAULT_WEIGHTS
+) -> List[float]:
+    """Scores a batch of targets against one base release, resolving the base's scorer only once."""
+    scorer = build_scorer(base_feats, weights)
+    return [scorer(target_feats) for target_feats in targets]
+
+@functools.lru_cache(maxsize=200_000)
+def score_against_base(
+    base_feats: ReleaseFeatures, target_feats: ReleaseFeatures, weights: Weights = DEFAULT_WEIGHTS
+) -> float:
+    """Calculates a similarity score between two releases using weighted factors and Jaccard similarity for styles.
+    Memoized across requests, since popular seeds keep getting compared to the same candidates. The cache is
+    keyed on the features themselves rather than release IDs, so a release whose data changed simply misses.
+    The score isn't symmetric (the completeness bonus is relative to the base), so the key is ordered."""
+    return build_scorer(base_feats, weights)(target_feats)
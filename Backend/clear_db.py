@@ -2,6 +2,7 @@ import asyncio
 import os
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -23,17 +24,15 @@ async def clear_database():
         database_url = database_url.replace("postgresql://", "postgresql+asyncpg://")
 
     print(f"Connecting to database...")
-    engine = create_async_engine(database_url)
+    # One-shot script: no pool, so the connection is closed as soon as it's released
+    engine = create_async_engine(database_url, poolclass=NullPool)
 
-    async with engine.connect() as conn:
+    # engine.begin() commits when the block exits
+    async with engine.begin() as conn:
         print("Clearing music data tables (artists, releases, tracks, track_artist)...")
+        # One statement drops all four tables in a single round trip.
         # Using CASCADE to automatically drop dependent objects like foreign key constraints.
-        # The order matters if not using CASCADE, but with it, it's more robust.
-        await conn.execute(text("DROP TABLE IF EXISTS track_artist CASCADE"))
-        await conn.execute(text("DROP TABLE IF EXISTS tracks CASCADE"))
-        await conn.execute(text("DROP TABLE IF EXISTS releases CASCADE"))
-        await conn.execute(text("DROP TABLE IF EXISTS artists CASCADE"))
-        await conn.commit()
+        await conn.execute(text("DROP TABLE IF EXISTS track_artist, tracks, releases, artists CASCADE"))
         print("Tables cleared successfully.")
 
     await engine.dispose()
@@ -1,7 +1,10 @@
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
+from app.core.config import settings
 from app.api import releases, users, collections, recommendations, auth, jobs
+from app.services.discogs import close_discogs_service
+from contextlib import asynccontextmanager
 import traceback
 import logging
 import uvicorn # For running programmatically
@@ -10,13 +13,20 @@ import os # For path manipulation
 
 
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Configure logging (LOG_LEVEL setting, e.g. WARNING in production)
+logging.basicConfig(level=settings.LOG_LEVEL.upper())
 logger = logging.getLogger("app")
 logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
 
-# Create the app instance with debug mode enabled
-app = FastAPI(title="Spinly API", debug=True)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    await close_discogs_service()
+
+# Create the app instance. Starlette's debug mode is left off: it would bypass global_exception_handler,
+# which includes the traceback itself when SPINLY_DEBUG is set.
+# Responses are serialized with orjson, which is several times faster than the stdlib json encoder.
+app = FastAPI(title="Spinly API", lifespan=lifespan, default_response_class=ORJSONResponse)
 
 # Configure CORS
 app.add_middleware(
@@ -30,16 +40,13 @@ app.add_middleware(
 # Add exception handler for detailed error responses
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
-    error_detail = traceback.format_exc()
-    logger.error(f"Unhandled exception: {str(exc)}\n{error_detail}")
-    return JSONResponse(
-        status_code=500,
-        content={
-            "error": str(exc),
-            "detail": error_detail,
-            "path": request.url.path
-        }
-    )
+    # The logging handler formats the traceback; it's only formatted for the response in debug mode
+    logger.exception("Unhandled exception on %s", request.url.path, exc_info=exc)
+    content = {"error": "Internal server error", "path": request.url.path}
+    if settings.SPINLY_DEBUG:
+        content["error"] = str(exc)
+        content["detail"] = "".join(traceback.format_exception(exc))
+    return ORJSONResponse(status_code=500, content=content)
 
 # Include routes
 app.include_router(users.router, prefix="/api", tags=["users"])
@@ -59,4 +66,8 @@ if __name__ == "__main__":
     # This block runs when the script is executed directly (e.g., python Backend/main.py or by clicking 'Run' in an IDE)
     # For Render deployment, use 0.0.0.0 and PORT from environment
     port = int(os.environ.get("PORT", 8000))
-    uvicorn.run("main:app", host="0.0.0.0", port=port, log_level="info")
+    # uvicorn picks uvloop and httptools up automatically (both are in requirements.txt).
+    # WEB_CONCURRENCY sets the number of worker processes. It defaults to 1 because the Discogs rate limiter
+    # and caches are per process, so every extra worker adds its own share of Discogs requests.
+    workers = int(os.environ.get("WEB_CONCURRENCY", 1))
+    uvicorn.run("main:app", host="0.0.0.0", port=port, workers=workers, log_level="info", access_log=False)
@@ -1,7 +1,6 @@
 import sys
 import os
 import asyncio
-from datetime import datetime
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'Backend')))
 
@@ -10,7 +9,9 @@ from app.models.artist import Artist
 from app.models.collection import Collection
 from app.models.release import Release
 from app.models.track import Track
+from app.models.track_artist import track_artist
 from app.services.database import engine
+from sqlalchemy import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import sessionmaker
 
@@ -20,101 +21,85 @@ async def create_demo_data():
         engine, class_=AsyncSession, expire_on_commit=False
     )
 
+    # Each table is seeded with one multi-row INSERT ... RETURNING id, in the order the rows are listed,
+    # so the generated IDs can be wired into the rows that reference them without a flush per table.
     async with async_session() as session:
         # Create demo users
-        users = [
-            User(
-                username="sam",
-                email="samanthamillows@gmail.com",
-                password_hash="demo_password_hash",  # In production, use proper password hashing
-            ),
-            User(
-                username="vinyl_lover",
-                email="vinyl@example.com",
-                password_hash="demo_password_hash",
-            )
-        ]
-        session.add_all(users)
-        await session.flush()
+        user_ids = (await session.execute(
+            insert(User).returning(User.id, sort_by_parameter_order=True),
+            [
+                {
+                    "username": "sam",
+                    "email": "samanthamillows@gmail.com",
+                    "password_hash": "demo_password_hash",  # In production, use proper password hashing
+                },
+                {
+                    "username": "vinyl_lover",
+                    "email": "vinyl@example.com",
+                    "password_hash": "demo_password_hash",
+                },
+            ],
+        )).scalars().all()
 
         # Create demo artists
-        artists = [
-            Artist(
-                name="The Beatles",
-                discogs_id=123456
-            ),
-            Artist(
-                name="Pink Floyd",
-                discogs_id=234567
-            ),
-            Artist(
-                name="Miles Davis",
-                discogs_id=345678
-            )
-        ]
-        session.add_all(artists)
-        await session.flush()
+        artist_ids = (await session.execute(
+            insert(Artist).returning(Artist.id, sort_by_parameter_order=True),
+            [
+                {"name": "The Beatles", "discogs_id": 123456},
+                {"name": "Pink Floyd", "discogs_id": 234567},
+                {"name": "Miles Davis", "discogs_id": 345678},
+            ],
+        )).scalars().all()
 
-        # Create demo releases
+        # Create demo releases.
+        # Bulk inserts skip the model's validators, so the normalized styles are filled in here.
         releases = [
-            Release(
-                discogs_id=1234567,
-                title="Abbey Road",
-                artist="The Beatles",
-                style="Rock"
-            ),
-            Release(
-                discogs_id=2345678,
-                title="Dark Side of the Moon",
-                artist="Pink Floyd",
-                style="Progressive Rock"
-            ),
-            Release(
-                discogs_id=3456789,
-                title="Kind of Blue",
-                artist="Miles Davis",
-                style="Jazz"
-            )
+            {"discogs_id": 1234567, "title": "Abbey Road", "artist_id": artist_ids[0], "styles": ["Rock"]},
+            {"discogs_id": 2345678, "title": "Dark Side of the Moon", "artist_id": artist_ids[1], "styles": ["Progressive Rock"]},
+            {"discogs_id": 3456789, "title": "Kind of Blue", "artist_id": artist_ids[2], "styles": ["Jazz"]},
         ]
-        session.add_all(releases)
-        await session.flush()
+        for release in releases:
+            release["styles_norm"] = [style.lower() for style in release["styles"]]
+        release_ids = (await session.execute(
+            insert(Release).returning(Release.id, sort_by_parameter_order=True), releases
+        )).scalars().all()
 
         # Create demo collections
-        collections = [
-            Collection(
-                name="Classic Rock",
-                user_id=users[0].id
-            ),
-            Collection(
-                name="Jazz Essentials",
-                user_id=users[1].id
-            )
-        ]
-        session.add_all(collections)
-        await session.flush()
+        await session.execute(
+            insert(Collection),
+            [
+                {"name": "Classic Rock", "user_id": user_ids[0]},
+                {"name": "Jazz Essentials", "user_id": user_ids[1]},
+            ],
+        )
 
         # Create demo tracks
-        tracks = [
-            Track(
-                title="Come Together",
-                artist_id=artists[0].id,  # The Beatles
-                discogs_id=11111,
-                youtube_url="https://youtube.com/watch?v=45cYwDMibGo"
-            ),
-            Track(
-                title="Money",
-                artist_id=artists[1].id,  # Pink Floyd
-                discogs_id=22222,
-                youtube_url="https://youtube.com/watch?v=cpbbuaIA3Ds"
-            ),
-            Track(
-                title="So What",
-                artist_id=artists[2].id,  # Miles Davis
-                discogs_id=33333,
-                youtube_url="https://youtube.com/watch?v=zqNTltOGh5c"
-            )
-        ]
-        session.add_all(tracks)
+        track_ids = (await session.execute(
+            insert(Track).returning(Track.id, sort_by_parameter_order=True),
+            [
+                {
+                    "title": "Come Together",
+                    "release_id": release_ids[0],  # Abbey Road
+                    "youtube_url": "https://youtube.com/watch?v=45cYwDMibGo",
+                },
+                {
+                    "title": "Money",
+                    "release_id": release_ids[1],  # Dark Side of the Moon
+                    "youtube_url": "https://youtube.com/watch?v=cpbbuaIA3Ds",
+                },
+                {
+                    "title": "So What",
+                    "release_id": release_ids[2],  # Kind of Blue
+                    "youtube_url": "https://youtube.com/watch?v=zqNTltOGh5c",
+                },
+            ],
+        )).scalars().all()
+
+        # Link each track to its artist
+        await session.execute(
+            insert(track_artist),
+            [{"track_id": track_id, "artist_id": artist_id} for track_id, artist_id in zip(track_ids, artist_ids)],
+        )
 
         # Commit all changes
         await session.commit()